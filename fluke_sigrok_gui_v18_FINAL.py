@@ -34,11 +34,13 @@ def _app_icon() -> QIcon:
         return QIcon()
 
 
+import math
 import os
 import re
 import sys
+import time
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from PySide6.QtCore import Qt, QProcess, QTimer
 from PySide6.QtGui import QFont, QIcon, QPixmap
@@ -255,6 +257,107 @@ def list_com_ports() -> list[tuple[str, str]]:
     return ports
 
 
+# Windows friendly names carry the port name, e.g. "Prolific USB-to-Serial Comm Port (COM3)".
+_PORT_SUFFIX_RE = re.compile(r"\s*\((?:COM\d+|/dev/[^)]+)\)\s*$", re.IGNORECASE)
+
+
+def _port_description(desc: object) -> str:
+    """Port description without a trailing ' (COMn)', so it survives a port rename."""
+    return _PORT_SUFFIX_RE.sub("", str(desc or "")).strip()
+
+
+def _port_identity(device: str) -> dict[str, object]:
+    """Return stable USB attributes for a port so it can be found again if its name changes."""
+    if list_ports is None or not device:
+        return {}
+    for p in list_ports.comports():
+        if getattr(p, "device", "") == device:
+            return {
+                "serial_number": getattr(p, "serial_number", None),
+                "vid": getattr(p, "vid", None),
+                "pid": getattr(p, "pid", None),
+                "description": _port_description(getattr(p, "description", "")),
+            }
+    return {}
+
+
+def _find_port(device: str, identity: dict[str, object]) -> str:
+    """Locate the meter's port again after a disconnect.
+
+    Returns the original device if it is still present, otherwise a port whose USB
+    serial number (or VID/PID + description) matches, otherwise ''.
+    Without pyserial we cannot enumerate, so the original device is assumed present.
+    """
+    if list_ports is None:
+        return device
+    ports = list(list_ports.comports())
+    if any(getattr(p, "device", "") == device for p in ports):
+        return device
+    if not identity:
+        return ""
+    serial = identity.get("serial_number")
+    if serial:
+        for p in ports:
+            if getattr(p, "serial_number", None) == serial:
+                return getattr(p, "device", "") or ""
+        return ""
+    if identity.get("vid") is None:
+        return ""
+    for p in ports:
+        if (
+            getattr(p, "vid", None) == identity.get("vid")
+            and getattr(p, "pid", None) == identity.get("pid")
+            and _port_description(getattr(p, "description", "")) == _port_description(identity.get("description"))
+        ):
+            return getattr(p, "device", "") or ""
+    return ""
+
+
+# Failure classes used by the acquisition supervisor.
+FAIL_PORT_GONE = "port_gone"
+FAIL_TIMEOUT = "driver_timeout"
+FAIL_METER_OFF = "meter_off"
+FAIL_START = "failed_to_start"
+FAIL_OTHER = "error"
+
+# Reconnect backoff (seconds): 1, 2, 4, ... capped at RETRY_MAX_S, retried until Stop.
+RETRY_BASE_S = 1.0
+RETRY_MAX_S = 60.0
+
+
+def _classify_failure(output: str, port_present: bool) -> str:
+    """Guess why a sigrok-cli poll failed from its output and whether the port still exists."""
+    t = output.lower()
+    if not port_present:
+        return FAIL_PORT_GONE
+    if any(k in t for k in ("no such file", "no such device", "could not open", "failed to open",
+                            "access is denied", "cannot find the file", "does not exist")):
+        return FAIL_PORT_GONE
+    if "timeout" in t or "timed out" in t:
+        return FAIL_TIMEOUT
+    if "no devices found" in t or "no response" in t or not t.strip():
+        return FAIL_METER_OFF
+    return FAIL_OTHER
+
+
+def _retry_delay_s(attempt: int) -> float:
+    """Bounded exponential backoff for reconnect attempt number `attempt` (1-based)."""
+    # Clamp the exponent first: 2 ** attempt overflows float after ~1000 attempts (~17 h at the cap).
+    exponent = min(max(attempt - 1, 0), math.ceil(math.log2(RETRY_MAX_S / RETRY_BASE_S)))
+    return min(RETRY_BASE_S * (2 ** exponent), RETRY_MAX_S)
+
+
+def _format_duration(seconds: float) -> str:
+    s = int(round(seconds))
+    h, rem = divmod(s, 3600)
+    m, s = divmod(rem, 60)
+    if h:
+        return f"{h}h{m:02d}m{s:02d}s"
+    if m:
+        return f"{m}m{s:02d}s"
+    return f"{seconds:.1f}s"
+
+
 class MainWindow(QMainWindow):
     def __init__(self) -> None:
         super().__init__()
@@ -287,6 +390,7 @@ class MainWindow(QMainWindow):
         self.proc.setProcessChannelMode(QProcess.ProcessChannelMode.MergedChannels)
         self.proc.readyReadStandardOutput.connect(self.on_ready_read)
         self.proc.finished.connect(self.on_proc_finished)
+        self.proc.errorOccurred.connect(self.on_proc_error)
 
         # Polling engine
         self.running = False
@@ -295,8 +399,36 @@ class MainWindow(QMainWindow):
         self.poll_timer.setInterval(250)  # ms; adjust later if needed
         self.poll_timer.timeout.connect(self.poll_once)
 
+        # Supervisor: on a failed poll, retry with backoff instead of stopping the session.
+        self.retry_timer = QTimer(self)
+        self.retry_timer.setSingleShot(True)
+        self.retry_timer.timeout.connect(self._retry_poll)
+        # Refreshes the "Reconnecting ... down X" text while an outage is open.
+        self.status_timer = QTimer(self)
+        self.status_timer.setInterval(1000)
+        self.status_timer.timeout.connect(self._update_link_status)
+        self.active_port = ""
+        self.port_identity: dict[str, object] = {}
+        self.poll_output: list[str] = []
+        self.poll_record: list[str] = []
+        self.poll_got_sample = False
+        self.retry_attempt = 0
+        self.poll_started = 0.0
+        self.outage_start: float | None = None
+        self.outage_reason = ""
+
+        # Availability stats for the current session
+        self.session_start: float | None = None
+        self.outage_count = 0
+        self.recovered_count = 0
+        self.total_downtime = 0.0
+        self.last_recover_s: float | None = None
+        self.total_recover_s = 0.0
+        self.max_recover_s = 0.0
+
         # UI state
         self.last_sample_dt: datetime | None = None
+        self.last_sample_mono: float | None = None
         self.value_text = "—"
         self.header_raw = ""
         self.header_text = ""
@@ -341,6 +473,9 @@ class MainWindow(QMainWindow):
         self.start_btn.clicked.connect(self.start)
         self.stop_btn.clicked.connect(self.stop)
 
+        self.link_lbl = QLabel("")
+        conn_grid.addWidget(self.link_lbl, 1, 0, 1, 3)
+
         conn_grid.addWidget(self.start_btn, 1, 3)
         conn_grid.addWidget(self.stop_btn, 1, 4)
 
@@ -455,6 +590,50 @@ class MainWindow(QMainWindow):
         self.com_combo.setEnabled(not running)
         self.refresh_btn.setEnabled(not running)
 
+    def _write_marker(self, text: str) -> None:
+        # CSV comment line (';' prefix, like sigrok's own comments) so data readers can skip it.
+        if self.rec_fp is not None:
+            try:
+                self.rec_fp.write(f"; {datetime.now().isoformat(timespec='seconds')} {text}\n")
+                self.rec_fp.flush()
+            except Exception:
+                pass
+
+    def _update_link_status(self) -> None:
+        if self.session_start is None:
+            self.link_lbl.setText("")
+            return
+        if not self.running:
+            state = "Stopped"
+        elif self.outage_start is not None:
+            down = time.monotonic() - self.outage_start
+            state = f"Reconnecting ({self.outage_reason}, try {self.retry_attempt}, down {_format_duration(down)})"
+        else:
+            state = "Link OK"
+        parts = [state]
+        if self.outage_count:
+            downtime = self.total_downtime
+            if self.outage_start is not None:
+                downtime += time.monotonic() - self.outage_start
+            parts.append(f"outages: {self.outage_count}")
+            parts.append(f"downtime: {_format_duration(downtime)}")
+            if self.last_recover_s is not None:
+                parts.append(f"last recover: {_format_duration(self.last_recover_s)}")
+                parts.append(f"mean recover: {_format_duration(self.total_recover_s / self.recovered_count)}")
+        self.link_lbl.setText(" | ".join(parts))
+
+    def _availability_summary(self) -> str:
+        elapsed = time.monotonic() - self.session_start if self.session_start is not None else 0.0
+        avail = 100.0 * (1.0 - self.total_downtime / elapsed) if elapsed > 0 else 100.0
+        if self.recovered_count:
+            ttr = f"mttr={self.total_recover_s / self.recovered_count:.1f}s max_ttr={self.max_recover_s:.1f}s"
+        else:
+            ttr = "mttr=- max_ttr=-"
+        return (
+            f"elapsed={elapsed:.1f}s downtime={self.total_downtime:.1f}s "
+            f"outages={self.outage_count} recovered={self.recovered_count} {ttr} availability={avail:.2f}%"
+        )
+
     def _close_recording(self) -> None:
         if self.rec_fp is not None:
             try:
@@ -495,19 +674,39 @@ class MainWindow(QMainWindow):
         self.header_text = ""
         self.header_small = ""
         self.last_sample_dt = None
+        self.last_sample_mono = None
         self._apply_readout()
 
         self.running = True
         self.poll_inflight = False
         self.update_ui_state(running=True)
 
+        # Supervisor / availability state
+        self.active_port = com
+        self.port_identity = _port_identity(com)
+        self.retry_attempt = 0
+        self.outage_start = None
+        self.outage_reason = ""
+        self.session_start = time.monotonic()
+        self.outage_count = 0
+        self.recovered_count = 0
+        self.total_downtime = 0.0
+        self.last_recover_s = None
+        self.total_recover_s = 0.0
+        self.max_recover_s = 0.0
+        self._write_marker(f"SESSION START port={com}")
+        self._update_link_status()
+
         # Kick off immediately, then timer keeps it going
         self.poll_once()
         self.poll_timer.start()
 
     def stop(self) -> None:
+        was_running = self.running
         self.running = False
         self.poll_timer.stop()
+        self.retry_timer.stop()
+        self.status_timer.stop()
 
         if self.proc.state() != QProcess.ProcessState.NotRunning:
             self.proc.terminate()
@@ -516,8 +715,20 @@ class MainWindow(QMainWindow):
                 self.proc.waitForFinished(1200)
 
         self.poll_inflight = False
+        if was_running:
+            if self.outage_start is not None:
+                # Stopped while still disconnected: count it as downtime, but not as a recovery.
+                down = time.monotonic() - self.outage_start
+                self.total_downtime += down
+                self.outage_start = None
+                self._write_marker(
+                    f"GAP END reason={self.outage_reason} ended=stopped downtime={down:.1f}s "
+                    f"attempts={self.retry_attempt} port={self.active_port}"
+                )
+            self._write_marker(f"SESSION STOP {self._availability_summary()}")
         self._close_recording()
         self.update_ui_state(running=False)
+        self._update_link_status()
 
     # ---------------- Polling ----------------
 
@@ -530,7 +741,7 @@ class MainWindow(QMainWindow):
             return
 
         sigrok = self.sigrok_path_edit.text().strip()
-        com = self.current_com_port()
+        com = self.active_port
 
         # One-sample acquisition; this forces sigrok to emit the current header each time.
         args = [
@@ -540,8 +751,73 @@ class MainWindow(QMainWindow):
             "-O", "csv",
         ]
         self.poll_inflight = True
+        self.poll_started = time.monotonic()
+        self.poll_output = []
+        self.poll_record = []
+        self.poll_got_sample = False
         self.proc.start(sigrok, args)
 
+    # ---------------- Supervisor ----------------
+
+    def _on_poll_failed(self, code: int, reason: str) -> None:
+        """Enter (or stay in) the reconnecting state and schedule the next attempt."""
+        if self.outage_start is None:
+            # The gap begins at the last good sample (or when the failing poll was launched),
+            # not when sigrok-cli finally gave up, which can be seconds later after a timeout.
+            now = time.monotonic()
+            self.outage_start = self.last_sample_mono if self.last_sample_mono is not None else self.poll_started
+            self.outage_count += 1
+            self.poll_timer.stop()
+            self.status_timer.start()
+            since = datetime.now() - timedelta(seconds=now - self.outage_start)
+            self._write_marker(
+                f"GAP START reason={reason} code={code} port={self.active_port} "
+                f"since={since.isoformat(timespec='seconds')}"
+            )
+        self.outage_reason = reason
+        self.retry_attempt += 1
+        self.retry_timer.start(int(_retry_delay_s(self.retry_attempt) * 1000))
+        self._update_link_status()
+
+    def _on_poll_recovered(self) -> None:
+        down = time.monotonic() - self.outage_start
+        self.outage_start = None
+        self.recovered_count += 1
+        self.total_downtime += down
+        self.last_recover_s = down
+        self.total_recover_s += down
+        self.max_recover_s = max(self.max_recover_s, down)
+        self.status_timer.stop()
+        self._write_marker(
+            f"GAP END reason={self.outage_reason} downtime={down:.1f}s "
+            f"attempts={self.retry_attempt} port={self.active_port}"
+        )
+        self.retry_attempt = 0
+        self.outage_reason = ""
+        self.poll_timer.start()
+        self._update_link_status()
+
+    def _retry_poll(self) -> None:
+        if not self.running:
+            return
+        # The device node may have changed (e.g. USB re-enumeration): look the port up again.
+        port = _find_port(self.active_port, self.port_identity)
+        if not port and not self.port_identity:
+            # Nothing to match a renamed port against (e.g. a port typed from the COM1..COM32
+            # fallback list): keep retrying the original port, sigrok-cli will tell us if it's back.
+            port = self.active_port
+        if not port:
+            self._on_poll_failed(-1, FAIL_PORT_GONE)
+            return
+        if port != self.active_port:
+            self._write_marker(f"PORT CHANGED {self.active_port} -> {port}")
+            self.active_port = port
+            self.refresh_ports()
+            idx = self.com_combo.findData(port)
+            if idx >= 0:
+                self.com_combo.setCurrentIndex(idx)
+        self.poll_once()
+
     # ---------------- Process parsing ----------------
 
     def on_ready_read(self) -> None:
@@ -554,19 +830,17 @@ class MainWindow(QMainWindow):
             line = raw_line.strip("\r\n")
             if not line:
                 continue
+            self.poll_output.append(line)
 
-            # Record raw line as-is if enabled
-            if self.rec_fp is not None:
-                try:
-                    self.rec_fp.write(line + "\n")
-                    self.rec_fp.flush()
-                except Exception:
-                    pass
-
-            # Hide driver noise always
+            # Hide driver noise always (and keep it out of the CSV file)
             if line.startswith("sr:") or line.startswith("srd:") or line.startswith("WARNING:") or line.startswith("ERROR:"):
                 continue
 
+            # Record raw line as-is if enabled; written in on_proc_finished only if the poll
+            # succeeded, so error text from failed polls never lands in the data file.
+            if self.rec_fp is not None:
+                self.poll_record.append(line)
+
             # CSV comments
             if line.lstrip().startswith(";"):
                 continue
@@ -591,7 +865,9 @@ class MainWindow(QMainWindow):
                 self.header_small = mode if (mode and mode != unit_disp) else ""
 
                 self.value_text = "OL"
+                self.poll_got_sample = True
                 self.last_sample_dt = datetime.now()
+                self.last_sample_mono = time.monotonic()
                 self._apply_readout()
                 continue
 
@@ -623,7 +899,9 @@ class MainWindow(QMainWindow):
                 self.header_text = f"{unit_disp} {mode}".strip() if (mode and mode != unit_disp) else unit_disp
                 self.header_small = mode if (mode and mode != unit_disp) else ""
 
+                self.poll_got_sample = True
                 self.last_sample_dt = datetime.now()
+                self.last_sample_mono = time.monotonic()
                 self._apply_readout()
                 continue
 
@@ -631,16 +909,41 @@ class MainWindow(QMainWindow):
         # Mark poll as complete; next timer tick will start a new run.
         self.poll_inflight = False
 
-        # If sigrok fails repeatedly (wrong COM / interface unplugged), stop gracefully.
-        if self.running and code != 0:
-            # Don't spam dialogs; just stop after a single failure.
-            self.stop()
-            QMessageBox.critical(
-                self,
-                "sigrok-cli error",
-                f"sigrok-cli exited with code {code}.\n\n"
-                "Check that the meter interface is connected and the correct COM port is selected.",
-            )
+        if not self.running:
+            return
+
+        # A failed poll (IR cable glitch, meter auto-power-off, port re-enumerated) no longer
+        # ends the session: classify it and let the supervisor retry with backoff.
+        # The same test decides entering and leaving an outage: sigrok-cli exits 0 after
+        # "No devices found.", and a crash can report code 0, so a poll only counts as good
+        # if it exited normally with code 0 and actually produced a sample.
+        failed = code != 0 or status != QProcess.ExitStatus.NormalExit or not self.poll_got_sample
+        if failed:
+            port_present = _find_port(self.active_port, {}) == self.active_port
+            reason = _classify_failure("\n".join(self.poll_output), port_present)
+            self._on_poll_failed(code, reason)
+        elif self.outage_start is not None:
+            self._on_poll_recovered()
+
+        if not failed and self.poll_record and self.rec_fp is not None:
+            try:
+                self.rec_fp.write("\n".join(self.poll_record) + "\n")
+                self.rec_fp.flush()
+            except Exception:
+                pass
+        self.poll_record = []
+
+    def on_proc_error(self, error) -> None:
+        # FailedToStart never emits finished(), so without this poll_inflight would stay True
+        # and every later poll/retry would return early. A crash does emit finished() with
+        # CrashExit, which on_proc_finished already routes to the supervisor; handling it
+        # here as well would count the same poll twice.
+        if error != QProcess.ProcessError.FailedToStart:
+            return
+        self.poll_inflight = False
+        self.poll_record = []
+        if self.running:
+            self._on_poll_failed(-1, FAIL_START)
 
     def _apply_readout(self) -> None:
         self.value_big.setText(self.value_text or "—")
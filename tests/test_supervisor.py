@@ -0,0 +1,378 @@
+"""Checks for the acquisition supervisor: pure helpers and the outage state machine.
+
+The GUI script needs PySide6 at import time, so the helpers and the relevant MainWindow
+methods are pulled out of its source and executed on their own with a stubbed
+`list_ports`, QProcess, timers, clock and CSV file.
+"""
+
+import ast
+import io
+import math
+import os
+import re
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Tuple
+
+import pytest
+
+SCRIPT = Path(__file__).resolve().parent.parent / "fluke_sigrok_gui_v18_FINAL.py"
+HELPERS = {"_port_description", "_retry_delay_s", "_classify_failure", "_find_port", "_port_identity", "_format_duration"}
+
+
+def _load_helpers(ports=None) -> dict:
+    tree = ast.parse(SCRIPT.read_text(encoding="utf-8"))
+    body = []
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name in HELPERS:
+            body.append(node)
+        elif isinstance(node, ast.Assign) and any(
+            isinstance(t, ast.Name) and t.id.startswith(("FAIL_", "RETRY_", "_PORT_SUFFIX_RE")) for t in node.targets
+        ):
+            body.append(node)
+    list_ports = None if ports is None else SimpleNamespace(comports=lambda: list(ports))
+    ns = {"math": math, "re": re, "list_ports": list_ports}
+    exec(compile(ast.Module(body=body, type_ignores=[]), str(SCRIPT), "exec"), ns)
+    return ns
+
+
+def _port(device, serial_number=None, vid=None, pid=None, description=""):
+    return SimpleNamespace(device=device, serial_number=serial_number, vid=vid, pid=pid, description=description)
+
+
+@pytest.fixture
+def h():
+    return _load_helpers()
+
+
+def test_backoff_doubles_then_caps(h):
+    delays = [h["_retry_delay_s"](n) for n in range(1, 9)]
+    assert delays == [1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 60.0, 60.0]
+
+
+@pytest.mark.parametrize("attempt", [1026, 10_000, 10**9])
+def test_backoff_large_attempt_does_not_overflow(h, attempt):
+    assert h["_retry_delay_s"](attempt) == h["RETRY_MAX_S"]
+
+
+@pytest.mark.parametrize(
+    "output, port_present, expected",
+    [
+        ("", False, "FAIL_PORT_GONE"),
+        ("sr: serial-libserialport: Failed to open /dev/ttyUSB0: No such file or directory", True, "FAIL_PORT_GONE"),
+        ("sr: serial: Could not open COM3: Access is denied.", True, "FAIL_PORT_GONE"),
+        ("srd: fluke-dmm: Timeout waiting for response", True, "FAIL_TIMEOUT"),
+        ("sr: read timed out", True, "FAIL_TIMEOUT"),
+        ("No devices found.", True, "FAIL_METER_OFF"),
+        ("", True, "FAIL_METER_OFF"),
+        ("Segmentation fault", True, "FAIL_OTHER"),
+    ],
+)
+def test_classify_failure(h, output, port_present, expected):
+    assert h["_classify_failure"](output, port_present) == h[expected]
+
+
+def test_find_port_keeps_present_device():
+    h = _load_helpers([_port("/dev/ttyUSB0", serial_number="A1")])
+    assert h["_find_port"]("/dev/ttyUSB0", {}) == "/dev/ttyUSB0"
+
+
+def test_find_port_by_serial_number_after_renumbering():
+    before = _load_helpers([_port("/dev/ttyUSB0", serial_number="A1", vid=0x0403, pid=0x6001)])
+    identity = before["_port_identity"]("/dev/ttyUSB0")
+    after = _load_helpers([
+        _port("/dev/ttyUSB1", serial_number="B2", vid=0x0403, pid=0x6001),
+        _port("/dev/ttyUSB2", serial_number="A1", vid=0x0403, pid=0x6001),
+    ])
+    assert after["_find_port"]("/dev/ttyUSB0", identity) == "/dev/ttyUSB2"
+
+
+def test_find_port_serial_mismatch_is_not_found():
+    h = _load_helpers([_port("COM5", serial_number="B2", vid=0x0403, pid=0x6001)])
+    identity = {"serial_number": "A1", "vid": 0x0403, "pid": 0x6001, "description": "FT232R"}
+    assert h["_find_port"]("COM3", identity) == ""
+
+
+def test_find_port_by_vid_pid_without_serial():
+    # Windows friendly names include the port, so the description changes with the rename.
+    before = _load_helpers([
+        _port("COM3", vid=0x067B, pid=0x2303, description="Prolific USB-to-Serial Comm Port (COM3)"),
+    ])
+    identity = before["_port_identity"]("COM3")
+    after = _load_helpers([
+        _port("COM4", vid=0x0403, pid=0x6001, description="USB Serial Port (COM4)"),
+        _port("COM7", vid=0x067B, pid=0x2303, description="Prolific USB-to-Serial Comm Port (COM7)"),
+    ])
+    assert after["_find_port"]("COM3", identity) == "COM7"
+
+
+def test_find_port_gone_without_identity():
+    h = _load_helpers([_port("COM4")])
+    assert h["_find_port"]("COM3", {}) == ""
+
+
+def test_find_port_without_pyserial_assumes_present(h):
+    assert h["_find_port"]("COM3", {}) == "COM3"
+
+
+def test_format_duration(h):
+    assert h["_format_duration"](3.24) == "3.2s"
+    assert h["_format_duration"](125) == "2m05s"
+    assert h["_format_duration"](7322) == "2h02m02s"
+
+
+# ---------------- Supervisor state machine ----------------
+
+WINDOW_METHODS = {
+    "poll_once", "on_ready_read", "on_proc_finished", "on_proc_error",
+    "_on_poll_failed", "_on_poll_recovered", "_retry_poll", "stop",
+    "_write_marker", "_update_link_status", "_availability_summary",
+}
+SKIP_TOP_LEVEL = {"ICON_B64", "_app_icon", "main"}
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.t = 0.0
+
+    def monotonic(self) -> float:
+        return self.t
+
+
+class FakeTimer:
+    def __init__(self) -> None:
+        self.active = False
+        self.interval = None
+
+    def start(self, msec=None) -> None:
+        self.active = True
+        if msec is not None:
+            self.interval = msec
+
+    def stop(self) -> None:
+        self.active = False
+
+
+class FakeProc:
+    def __init__(self) -> None:
+        self.started: list[tuple[str, list[str]]] = []
+        self.pending = b""
+
+    def state(self):
+        return "NotRunning"
+
+    def start(self, program, args) -> None:
+        self.started.append((program, list(args)))
+
+    def readAllStandardOutput(self) -> bytes:
+        out, self.pending = self.pending, b""
+        return out
+
+
+FakeQProcess = SimpleNamespace(
+    ProcessState=SimpleNamespace(NotRunning="NotRunning"),
+    ExitStatus=SimpleNamespace(NormalExit="NormalExit", CrashExit="CrashExit"),
+    ProcessError=SimpleNamespace(FailedToStart="FailedToStart", Crashed="Crashed"),
+)
+
+
+def _load_window(ports=None):
+    """Build a stub window class from the real MainWindow methods plus all module helpers."""
+    tree = ast.parse(SCRIPT.read_text(encoding="utf-8"))
+    body, methods = [], []
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name not in SKIP_TOP_LEVEL:
+            body.append(node)
+        elif isinstance(node, ast.Assign) and not any(
+            isinstance(t, ast.Name) and t.id in SKIP_TOP_LEVEL for t in node.targets
+        ):
+            body.append(node)
+        elif isinstance(node, ast.ClassDef) and node.name == "MainWindow":
+            methods = [m for m in node.body if isinstance(m, ast.FunctionDef) and m.name in WINDOW_METHODS]
+    body.append(ast.ClassDef(name="Window", bases=[], keywords=[], body=methods, decorator_list=[]))
+    ast.fix_missing_locations(body[-1])
+    clock = FakeClock()
+    list_ports = None if ports is None else SimpleNamespace(comports=lambda: list(ports))
+    ns = {
+        "math": math, "os": os, "re": re, "time": clock, "datetime": datetime, "timedelta": timedelta,
+        "Tuple": Tuple, "QProcess": FakeQProcess, "list_ports": list_ports,
+    }
+    exec(compile(ast.Module(body=body, type_ignores=[]), str(SCRIPT), "exec"), ns)
+    return ns, clock
+
+
+def _session(ns, port="COM3", identity=None):
+    """A window mid-session, with the state MainWindow.start() would set up."""
+    w = ns["Window"]()
+    w.proc = FakeProc()
+    w.poll_timer, w.retry_timer, w.status_timer = FakeTimer(), FakeTimer(), FakeTimer()
+    w.poll_timer.start()
+    w.sigrok_path_edit = SimpleNamespace(text=lambda: "sigrok-cli")
+    w.link_lbl = SimpleNamespace(text="", setText=lambda t: setattr(w.link_lbl, "text", t))
+    w.com_combo = SimpleNamespace(index=None, findData=lambda d: 0,
+                                  setCurrentIndex=lambda i: setattr(w.com_combo, "index", i))
+    w.refresh_ports = lambda: None
+    w.update_ui_state = lambda running: None
+    w._close_recording = lambda: None
+    w._apply_readout = lambda: None
+    w.rec_fp = io.StringIO()
+    w.running = True
+    w.poll_inflight = False
+    w.active_port = port
+    w.port_identity = identity or {}
+    w.poll_output, w.poll_record, w.poll_got_sample = [], [], False
+    w.poll_started = 0.0
+    w.retry_attempt = 0
+    w.outage_start = None
+    w.outage_reason = ""
+    w.session_start = 0.0
+    w.outage_count = w.recovered_count = 0
+    w.total_downtime = 0.0
+    w.last_recover_s = None
+    w.total_recover_s = w.max_recover_s = 0.0
+    w.last_sample_dt = w.last_sample_mono = None
+    w.header_raw = w.header_text = w.header_small = ""
+    w.value_text = "—"
+    return w
+
+
+GOOD = "V DC\n1.2345\n"
+METER_OFF = "No devices found.\n"
+
+
+def _poll(w, clock, t, output, code=0, status="NormalExit"):
+    clock.t = t
+    w.poll_once()
+    w.proc.pending = output.encode("utf-8")
+    w.on_ready_read()
+    w.on_proc_finished(code, status)
+
+
+def _csv_lines(w):
+    return w.rec_fp.getvalue().splitlines()
+
+
+def _marker_index(lines, text):
+    return next(i for i, line in enumerate(lines) if line.startswith(";") and text in line)
+
+
+def test_zero_exit_without_sample_starts_outage():
+    ns, clock = _load_window()
+    w = _session(ns)
+    _poll(w, clock, 10.0, GOOD)
+    assert w.outage_start is None and w.poll_timer.active
+
+    _poll(w, clock, 12.0, METER_OFF, code=0)
+    assert w.outage_start == 10.0  # measured from the last good sample, not the failing exit
+    assert w.outage_count == 1
+    assert w.outage_reason == ns["FAIL_METER_OFF"]
+    assert not w.poll_timer.active and w.status_timer.active
+    assert w.retry_timer.active and w.retry_timer.interval == 1000
+    assert "GAP START reason=meter_off" in w.rec_fp.getvalue()
+    assert w.link_lbl.text.startswith("Reconnecting")
+
+
+def test_crash_exit_with_code_zero_is_a_failure():
+    ns, clock = _load_window()
+    w = _session(ns)
+    _poll(w, clock, 1.0, GOOD, code=0, status="CrashExit")
+    assert w.outage_count == 1
+    assert "1.2345" not in w.rec_fp.getvalue()
+
+
+def test_recovery_needs_a_sample():
+    ns, clock = _load_window()
+    w = _session(ns)
+    _poll(w, clock, 10.0, GOOD)
+    _poll(w, clock, 12.0, METER_OFF)
+    _poll(w, clock, 13.0, METER_OFF)  # still no sample: stays in the outage, backs off further
+    assert w.outage_start == 10.0 and w.recovered_count == 0
+    assert w.retry_attempt == 2 and w.retry_timer.interval == 2000
+
+    _poll(w, clock, 20.0, "V DC\n2.5\n")
+    assert w.outage_start is None
+    assert w.outage_count == 1 and w.recovered_count == 1
+    assert w.last_recover_s == 10.0 and w.total_downtime == 10.0
+    assert w.retry_attempt == 0 and w.poll_timer.active and not w.status_timer.active
+
+    lines = _csv_lines(w)
+    assert _marker_index(lines, "GAP START") < _marker_index(lines, "GAP END") < lines.index("2.5")
+    assert "downtime=10.0s attempts=2" in lines[_marker_index(lines, "GAP END")]
+
+
+def test_failed_poll_output_is_not_recorded():
+    ns, clock = _load_window()
+    w = _session(ns)
+    _poll(w, clock, 1.0, GOOD)
+    _poll(w, clock, 2.0, "sr: serial: Timeout waiting for response\nERROR: bad\nV DC\n", code=1)
+    _poll(w, clock, 3.0, METER_OFF)
+    _poll(w, clock, 4.0, "srd: fluke-dmm: noise\n" + GOOD)
+
+    data = [line for line in _csv_lines(w) if not line.startswith(";")]
+    assert data == ["V DC", "1.2345", "V DC", "1.2345"]
+
+
+def test_stop_mid_outage_counts_downtime_but_not_a_recovery():
+    ns, clock = _load_window()
+    w = _session(ns)
+    _poll(w, clock, 10.0, GOOD)
+    _poll(w, clock, 11.0, METER_OFF)
+    clock.t = 100.0
+    w.stop()
+
+    assert w.total_downtime == 90.0
+    assert w.outage_count == 1 and w.recovered_count == 0 and w.last_recover_s is None
+    assert not (w.retry_timer.active or w.status_timer.active or w.poll_timer.active)
+    text = w.rec_fp.getvalue()
+    assert "GAP END reason=meter_off ended=stopped downtime=90.0s" in text
+    assert "downtime=90.0s outages=1 recovered=0 mttr=- max_ttr=-" in text
+
+
+def test_session_summary_reports_time_to_recover():
+    ns, clock = _load_window()
+    w = _session(ns)
+    _poll(w, clock, 10.0, GOOD)
+    _poll(w, clock, 11.0, METER_OFF)
+    _poll(w, clock, 14.0, GOOD)  # 4 s
+    _poll(w, clock, 15.0, METER_OFF)
+    _poll(w, clock, 22.0, GOOD)  # 8 s
+    clock.t = 100.0
+    w.stop()
+    assert "downtime=12.0s outages=2 recovered=2 mttr=6.0s max_ttr=8.0s availability=88.00%" in w.rec_fp.getvalue()
+
+
+def test_failed_to_start_enters_outage_and_unblocks_polling():
+    ns, clock = _load_window()
+    w = _session(ns)
+    clock.t = 5.0
+    w.poll_once()
+    w.on_proc_error("FailedToStart")
+    assert not w.poll_inflight
+    assert w.outage_count == 1 and w.outage_reason == ns["FAIL_START"]
+
+    w.on_proc_error("Crashed")  # delivered again via finished(CrashExit); not double-counted
+    assert w.retry_attempt == 1
+
+    w._retry_poll()
+    assert len(w.proc.started) == 2
+
+
+def test_retry_without_identity_relaunches_original_port():
+    ns, clock = _load_window([_port("COM1"), _port("COM4")])
+    w = _session(ns, port="COM9")
+    _poll(w, clock, 1.0, "", code=1)
+    assert w.outage_reason == ns["FAIL_PORT_GONE"]
+
+    w._retry_poll()
+    assert w.proc.started[-1][1][1] == "fluke-dmm:conn=COM9"
+
+
+def test_retry_follows_renamed_port():
+    ns, clock = _load_window([_port("COM7", serial_number="A1")])
+    w = _session(ns, port="COM3", identity={"serial_number": "A1", "vid": 1, "pid": 2, "description": ""})
+    _poll(w, clock, 1.0, "", code=1)
+    w._retry_poll()
+    assert w.active_port == "COM7"
+    assert w.proc.started[-1][1][1] == "fluke-dmm:conn=COM7"
+    assert "PORT CHANGED COM3 -> COM7" in w.rec_fp.getvalue()